@@ -0,0 +1,4 @@
+"""Micro-benchmarks for SkyTrack hot paths and a simulated SkyPilot backend.
+
+Run ``python -m benchmarks --help``; not shipped with the wheel.
+"""
@@ -0,0 +1,44 @@
+"""``python -m benchmarks [--quick] [--json out.json] [--compare base.json]``"""
+import argparse, json, sys
+
+from . import bench_logging, bench_sweep
+
+SUITES = {"logging": bench_logging, "sweep": bench_sweep}
+
+
+def main():
+    p = argparse.ArgumentParser(description="SkyTrack benchmarks")
+    p.add_argument("--only", choices=sorted(SUITES), action="append",
+                   help="Run only these suites (repeatable)")
+    p.add_argument("--quick", action="store_true", help="Smaller workloads")
+    p.add_argument("--wandb", choices=["noop", "offline"], default="noop",
+                   help="W&B backend for the logging suite")
+    p.add_argument("--json", help="Write results to this JSON file")
+    p.add_argument("--compare", help="Baseline JSON; exit 1 on regressions")
+    p.add_argument("--tolerance", type=float, default=0.25,
+                   help="Allowed relative slowdown vs. the baseline")
+    args = p.parse_args()
+
+    results = {}
+    for name in args.only or SUITES:
+        results.update(SUITES[name].run(quick=args.quick, wandb_mode=args.wandb))
+    width = max(map(len, results))
+    for key, val in results.items():
+        print(f"{key:<{width}}  {val:12.2f}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            base = json.load(f)
+        # every metric is lower-is-better (µs, hours, call counts)
+        worse = [k for k in results.keys() & base.keys()
+                 if results[k] > base[k] * (1 + args.tolerance) and results[k] > 0]
+        for k in sorted(worse):
+            print(f"REGRESSION {k}: {base[k]:.2f} → {results[k]:.2f}")
+        sys.exit(1 if worse else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""Per-call overhead of the SkyTrack logging hot paths.
+
+``wandb="noop"`` replaces ``wandb.log`` with a no-op so only SkyTrack's own
+cost is measured; ``wandb="offline"`` logs into a real offline run.
+"""
+from __future__ import annotations
+from contextlib import contextmanager
+from unittest import mock
+import tempfile, time, torch, wandb
+
+import skytrack.logging as stl
+from skytrack.downsample import Downsampler
+from skytrack.spool import Spool
+
+SIZES = {"mlp_64": 64, "mlp_256": 256, "mlp_1024": 1024}
+
+
+def _noop(*args, **kwargs):
+    pass
+
+
+def _per_call_us(fn, n: int, repeat: int = 5) -> float:
+    """Best-of-*repeat* mean wall time of ``fn(step)`` in microseconds."""
+    best = float("inf")
+    for r in range(repeat):
+        steps = range(r * n, (r + 1) * n)  # keep W&B steps monotonic
+        t0 = time.perf_counter()
+        for i in steps:
+            fn(i)
+        best = min(best, (time.perf_counter() - t0) / n)
+    return best * 1e6
+
+
+@contextmanager
+def _backend(mode: str):
+    if mode == "offline":
+        run = wandb.init(mode="offline", project="skytrack-bench")
+        try:
+            yield wandb.log
+        finally:
+            run.finish()
+    else:
+        with mock.patch.object(wandb, "log", _noop):
+            yield _noop
+
+
+@contextmanager
+def _configured(downsample=None, spool=None):
+    stl._DOWNSAMPLER, stl._SPOOL = downsample, spool
+    try:
+        yield
+    finally:
+        stl._DOWNSAMPLER, stl._SPOOL = None, None
+        if spool is not None:
+            spool.close(drain=False)
+
+
+def _mlp(width: int) -> torch.nn.Module:
+    model = torch.nn.Sequential(*[torch.nn.Linear(width, width) for _ in range(4)])
+    model(torch.randn(8, width)).sum().backward()
+    return model
+
+
+def run(quick: bool = False, wandb_mode: str = "noop") -> dict[str, float]:
+    """Microseconds per call for each hot path."""
+    n = 200 if quick else 2000
+    out: dict[str, float] = {}
+    row = lambda i: {"loss/train": 1.0 / (i + 1), "accuracy": 0.5, "reward/mean": 0.1}
+    with _backend(wandb_mode) as log_fn, tempfile.TemporaryDirectory() as tmp:
+        with _configured():
+            out["st.log/plain_us"] = _per_call_us(lambda i: stl.log(row(i), step=i), n)
+        with _configured(downsample=Downsampler(budget=100)):
+            out["st.log/downsample_us"] = _per_call_us(lambda i: stl.log(row(i), step=i), n)
+        with _configured(spool=Spool(tmp, log_fn=log_fn)):
+            out["st.log/spool_us"] = _per_call_us(lambda i: stl.log(row(i), step=i), n)
+
+        for groups in (1, 8):
+            params = [{"params": [torch.nn.Parameter(torch.zeros(1))]} for _ in range(groups)]
+            opt = torch.optim.SGD(params, lr=1e-3)
+            out[f"log_lr/groups_{groups}_us"] = _per_call_us(lambda i: stl.log_lr(opt, i), n)
+
+        for name, width in SIZES.items():
+            if quick and width > 256:
+                continue
+            model = _mlp(width)
+            reps = 10 if quick else 50
+            out[f"log_gradients/{name}_us"] = _per_call_us(
+                lambda i: stl.log_gradients(model, i, every=1), reps, repeat=3)
+            out[f"log_model_stats/{name}_us"] = _per_call_us(
+                lambda i: stl.log_model_stats(model, i, every=1, layers=2), reps, repeat=3)
+
+        try:
+            from transformers import TrainerState
+            from skytrack.callbacks import SkyTrackCallback
+        except ImportError:
+            return out
+        cb, state = SkyTrackCallback(), TrainerState()
+        logs = {"loss": 0.1, "learning_rate": 1e-4, "grad_norm": 1.0, "epoch": 0.5}
+
+        def on_log(i):
+            state.global_step = i
+            cb.on_log(None, state, None, logs=logs)
+        with _configured():
+            out["callback.on_log_us"] = _per_call_us(on_log, n)
+    return out
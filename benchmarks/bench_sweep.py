@@ -0,0 +1,81 @@
+"""Makespan and API-call counts of the sweep schedulers on ``FakeSky``."""
+from __future__ import annotations
+from contextlib import redirect_stdout
+from pathlib import Path
+import io, os, tempfile, time, yaml
+
+from .fake_sky import FakeSky, SimTimeout
+
+SIM = dict(provision=(60.0, 180.0), duration=(600.0, 1200.0),
+           fail_rate=0.1, preempt_rate=0.05, seed=0)
+
+
+def _simulate(name: str, fake: FakeSky, fn) -> dict[str, float]:
+    timed_out = 0
+    with fake.install(), redirect_stdout(io.StringIO()):
+        t0 = time.perf_counter()
+        try:
+            fn()
+        except SimTimeout:
+            timed_out = 1
+        wall = time.perf_counter() - t0
+    out = {
+        f"{name}/makespan_h": fake.clock.now / 3600,
+        f"{name}/wall_ms": wall * 1e3,
+        f"{name}/timed_out": timed_out,
+    }
+    for call, n in sorted(fake.calls.items()):
+        out[f"{name}/calls_{call}"] = n
+    return out
+
+
+def _run_sweep(tmp: Path, n_jobs: int, **overrides):
+    cfg = {
+        "type": "grid",
+        "command": "python train.py --lr {lr}",
+        "params": {"lr": [round(1e-5 * (i + 1), 6) for i in range(n_jobs)]},
+        "retry_limit": 2,
+        "max_concurrent": 4,
+        "state_file": str(tmp / f"jobs_{len(list(tmp.iterdir()))}.json"),
+        **overrides,
+    }
+
+    def go():
+        from skytrack.cli import run_sweep
+        run_sweep(cfg)
+    return go
+
+
+def _sky_tune(tmp: Path, n_jobs: int):
+    (tmp / "task.yaml").write_text(yaml.safe_dump({"run": "python train.py"}))
+    cfg = {
+        "mode": "grid",
+        "sweep": {"name": "bench", "template": "task.yaml",
+                  "max_parallel": 4, "max_retries": 2},
+        "grid": {"LR": [f"{i + 1}e-5" for i in range(n_jobs)]},
+        "slug_pattern": "lr{LR:g}_{uid}",
+    }
+    (tmp / "sweep.yaml").write_text(yaml.safe_dump(cfg))
+
+    def go():
+        from skytrack.sweep import sweep
+        cwd = os.getcwd()
+        os.chdir(tmp)  # sweep() writes .sky_tasks/ relative to cwd
+        try:
+            sweep("sweep.yaml")
+        finally:
+            os.chdir(cwd)
+    return go
+
+
+def run(quick: bool = False, **_) -> dict[str, float]:
+    """Simulate each scheduler on a seeded ``FakeSky``."""
+    n = 8 if quick else 32
+    results: dict[str, float] = {}
+    with tempfile.TemporaryDirectory() as d:
+        tmp = Path(d)
+        results.update(_simulate("run_sweep", FakeSky(**SIM), _run_sweep(tmp, n)))
+        results.update(_simulate("run_sweep_reuse", FakeSky(**SIM),
+                                 _run_sweep(tmp, n // 4, reuse_cluster=True)))
+        results.update(_simulate("sweep", FakeSky(**SIM), _sky_tune(tmp, n)))
+    return results
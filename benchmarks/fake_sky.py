@@ -0,0 +1,187 @@
+"""In-process stand-in for SkyPilot with a virtual clock.
+
+``FakeSky`` implements the slice of the ``sky`` Python API used by
+``skytrack.cli.run_sweep`` (``Resources``, ``Task``, ``launch``, ``exec``,
+``api_status``) and the ``sky status`` / ``sky launch`` CLI calls made by
+``skytrack.sweep.sweep``.  Provisioning latency, job durations and
+failure / preemption rates are drawn from a seeded RNG, and every
+``time.sleep`` in the schedulers advances a virtual clock instead of
+blocking, so a multi-hour sweep simulates in milliseconds::
+
+    fake = FakeSky(fail_rate=0.1, preempt_rate=0.05)
+    with fake.install():
+        from skytrack.cli import run_sweep
+        run_sweep(cfg)
+    fake.clock.now, fake.calls    # makespan (s), API-call counts
+"""
+from __future__ import annotations
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass
+from unittest import mock
+import importlib, itertools, json, random, subprocess, sys
+
+
+class SimTimeout(RuntimeError):
+    """The scheduler did not finish within the simulated time limit."""
+
+
+class SimClock:
+    """Replacement for the ``time`` module inside the schedulers."""
+
+    def __init__(self, limit: float):
+        self.now = 0.0
+        self.limit = limit
+
+    def time(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float):
+        self.now += seconds
+        if self.now > self.limit:
+            raise SimTimeout(f"no progress after {self.limit:.0f} simulated s")
+
+
+@dataclass
+class _Job:
+    request_id: str
+    cluster: str
+    ready_at: float   # provisioning done
+    end_at: float     # job finished / failed / preempted
+    status: str       # final status: SUCCEEDED | FAILED
+    error: str = ""
+    down: bool = False
+
+
+class FakeSky:
+    """Seeded SkyPilot simulator; see module docstring."""
+
+    CalledProcessError = subprocess.CalledProcessError
+
+    class Resources:
+        def __init__(self):
+            self.accelerators = self.cpus = self.memory = None
+            self.cloud = self.region = self.use_spot = None
+
+    class Task:
+        def __init__(self, run=None, envs=None, **kwargs):
+            self.run, self.envs, self.resources = run, envs or {}, None
+
+        def set_resources(self, resources):
+            self.resources = resources
+
+    def __init__(self, provision: tuple[float, float] = (60.0, 180.0),
+                 duration: tuple[float, float] = (600.0, 1200.0),
+                 fail_rate: float = 0.0, preempt_rate: float = 0.0,
+                 launch_error_rate: float = 0.0, seed: int = 0,
+                 time_limit: float = 30 * 86400.0):
+        self.provision, self.duration = provision, duration
+        self.fail_rate, self.preempt_rate = fail_rate, preempt_rate
+        self.launch_error_rate = launch_error_rate
+        self.rng = random.Random(seed)
+        self.clock = SimClock(time_limit)
+        self.calls: Counter[str] = Counter()
+        self.jobs: dict[str, _Job] = {}
+        self.clusters: dict[str, _Job] = {}  # name -> latest job
+        self._ids = itertools.count()
+
+    # ----------------------------------------------------------------- #
+    # Simulation core                                                    #
+    # ----------------------------------------------------------------- #
+    def _is_up(self, cluster: str) -> bool:
+        job = self.clusters.get(cluster)
+        if job is None:
+            return False
+        if self.clock.now < job.end_at:
+            return True
+        return not job.down and job.error != "preempted"
+
+    def _submit(self, cluster: str, down: bool) -> str:
+        now = self.clock.now
+        busy_until = max(now, self.clusters[cluster].end_at) if cluster in self.clusters else now
+        ready = busy_until if self._is_up(cluster) else now + self.rng.uniform(*self.provision)
+        run = self.rng.uniform(*self.duration)
+        roll = self.rng.random()
+        if roll < self.preempt_rate:
+            status, error, run = "FAILED", "preempted", run * self.rng.random()
+        elif roll < self.preempt_rate + self.fail_rate:
+            status, error, run = "FAILED", "job exited with code 1", run * self.rng.random()
+        else:
+            status, error = "SUCCEEDED", ""
+        job = _Job(f"req-{next(self._ids)}", cluster, ready, ready + run, status, error, down)
+        self.jobs[job.request_id] = job
+        self.clusters[cluster] = job
+        return job.request_id
+
+    def _status(self, job: _Job) -> str:
+        if self.clock.now < job.ready_at:
+            return "INIT"
+        if self.clock.now < job.end_at:
+            return "RUNNING"
+        return job.status
+
+    # ----------------------------------------------------------------- #
+    # ``sky`` Python API (skytrack.cli)                                  #
+    # ----------------------------------------------------------------- #
+    def launch(self, task, cluster_name=None, down=False, **kwargs) -> str:
+        self.calls["launch"] += 1
+        return self._submit(cluster_name or f"sky-{next(self._ids)}", down)
+
+    def exec(self, task, cluster_name=None, down=False, **kwargs) -> str:
+        self.calls["exec"] += 1
+        return self._submit(cluster_name, down)
+
+    def api_status(self, request_ids=None, **kwargs) -> list[dict]:
+        self.calls["api_status"] += 1
+        return [{"status": self._status(self.jobs[r]), "error": self.jobs[r].error}
+                for r in request_ids or ()]
+
+    # ----------------------------------------------------------------- #
+    # ``subprocess`` replacement for the ``sky`` CLI (skytrack.sweep)    #
+    # ----------------------------------------------------------------- #
+    def check_output(self, cmd, text: bool = False, **kwargs):
+        args = [str(c) for c in cmd]
+        if args[:2] != ["sky", "status"]:
+            raise ValueError(f"FakeSky cannot run {args}")
+        self.calls["status"] += 1
+        states = {name: self._status(job) for name, job in self.clusters.items()}
+        if "--format" in args:
+            out = json.dumps([{"name": n, "status": s} for n, s in states.items()])
+        else:
+            out = "\n".join(f"{n}  {s}" for n, s in states.items())
+        return out if text else out.encode()
+
+    def check_call(self, cmd, **kwargs) -> int:
+        args = [str(c) for c in cmd]
+        if args[:2] != ["sky", "launch"]:
+            raise ValueError(f"FakeSky cannot run {args}")
+        self.calls["launch"] += 1
+        if self.rng.random() < self.launch_error_rate:
+            raise subprocess.CalledProcessError(1, args)
+        self._submit(args[args.index("--name") + 1], down=False)
+        return 0
+
+    def call(self, cmd, **kwargs) -> int:
+        try:
+            return self.check_call(cmd, **kwargs)
+        except subprocess.CalledProcessError as e:
+            return e.returncode
+
+    # ----------------------------------------------------------------- #
+    @contextmanager
+    def install(self):
+        """Route ``skytrack.cli`` / ``skytrack.sweep`` through this simulator."""
+        # lets ``skytrack.cli`` import without SkyPilot installed
+        stub = sys.modules.setdefault("sky", self) is self
+        try:
+            # ``skytrack.sweep`` the function shadows the module on the package
+            cli = importlib.import_module("skytrack.cli")
+            sw = importlib.import_module("skytrack.sweep")
+            with mock.patch.object(cli, "sky", self), \
+                 mock.patch.object(cli, "time", self.clock), \
+                 mock.patch.object(sw, "subprocess", self), \
+                 mock.patch.object(sw, "time", self.clock):
+                yield self
+        finally:
+            if stub:
+                del sys.modules["sky"]
@@ -12,14 +12,16 @@ SkyTrack's goal is to give you **zero‑boilerplate, repeatable logging**
 across multiple repos and clusters, while staying 100 % compatible with
 raw ``wandb`` calls and SkyPilot job files.
 """
-from .logging import init, log, log_gradients, log_lr
+from .logging import (init, log, log_gradients, log_model_stats, log_lr,
+                      profile_step, flush)
 from .callbacks import SkyTrackCallback
 from .artifacts import log_artifacts
 from wandb import watch as watch
 from .sweep import sweep  # re-export
 
 __all__ = [
-    "init", "log", "log_gradients", "log_lr",
+    "init", "log", "log_gradients", "log_model_stats", "log_lr",
+    "profile_step", "flush",
     "SkyTrackCallback", "log_artifacts"
 ]
 
@@ -1,9 +1,22 @@
 """Hugging Face Trainer callback → forwards logs to W&B automatically."""
 from transformers import TrainerCallback
-import wandb
+from . import logging as _st
 
 class SkyTrackCallback(TrainerCallback):
     """Stream HF ``Trainer`` logs into Weights & Biases."""
+    def on_train_begin(self, args, state, control, **kwargs):
+        if _st._DOWNSAMPLER is not None and state.max_steps > 0:
+            _st._DOWNSAMPLER.set_horizon(state.max_steps)
+
+    def on_step_begin(self, args, state, control, **kwargs):
+        # global_step counts finished steps; the one starting now is +1
+        _st.profile_step(state.global_step + 1)
+
+    def on_train_end(self, args, state, control, **kwargs):
+        if _st._PROFILER is not None:
+            _st._PROFILER.close()
+        _st.flush()
+
     def on_log(self, args, state, control, logs=None, **kwargs):
         if logs:
-            wandb.log(logs, step=state.global_step)
+            _st.log(logs, step=state.global_step)
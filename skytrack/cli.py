@@ -1,11 +1,14 @@
 import argparse
 import yaml
 import itertools
+import json
 import time
 from typing import Any, Dict, List, Optional
 
 import sky
 
+from .profiler import ENV_VAR as PROFILE_ENV, env_value as _profile_env
+
 def load_config(path: str) -> Dict[str, Any]:
     """Load *YAML* config file."""
     with open(path, 'r', encoding='utf-8') as f:
@@ -88,6 +91,8 @@ def run_sweep(config: Dict[str, Any]):
     max_concurrent = config.get("max_concurrent", 1)
     reuse_cluster = config.get("reuse_cluster", False)
     state_file = config.get("state_file", "skytrack_jobs.json")
+    profile = config.get("profile")
+    envs = {PROFILE_ENV: _profile_env(profile)} if profile else None
 
     # Build list of parameter combinations or commands
     if sweep_type == "grid":
@@ -133,7 +138,7 @@ def run_sweep(config: Dict[str, Any]):
                 for attr, val in resource_kwargs.items():
                     if hasattr(resources, attr):
                         setattr(resources, attr, val)
-                task = sky.Task(run=run_command)
+                task = sky.Task(run=run_command, envs=envs)
                 task.set_resources(resources)
                 # Launch or exec on the same cluster
                 if job.attempts == 1:
@@ -192,7 +197,7 @@ def run_sweep(config: Dict[str, Any]):
                 for attr, val in resource_kwargs.items():
                     if hasattr(resources, attr):
                         setattr(resources, attr, val)
-                task = sky.Task(run=run_command)
+                task = sky.Task(run=run_command, envs=envs)
                 task.set_resources(resources)
                 cluster_name = f"tune-job{idx}-att{job.attempts}"
                 job.cluster_name = cluster_name
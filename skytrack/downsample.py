@@ -0,0 +1,243 @@
+"""Bounded-cardinality series downsampling in front of ``wandb.log``.
+
+Enable via ``st.init({"downsample": {...}})``::
+
+    downsample:
+      budget: 1000          # points per series
+      method: minmax        # minmax | lttb | none
+      horizon: 100000       # expected last step; omit to adapt on the fly
+      rules:                # first match wins, glob style as in define_metric
+        - {match: "loss/*", method: none}
+        - {match: "grad/*", budget: 300, group: 3, reduce: norm, max_series: 64}
+
+The first point of each bucket is logged at once, so sparse series
+(evaluation, one-off metrics) pass through unchanged; the bucket's other
+representatives are logged on later calls for the same series (W&B steps
+must stay monotonic) or by ``st.flush()``, which ``st.init`` runs before
+``run.finish()`` and at exit.  Every point carries a hidden
+``_step/<key>`` companion holding the step each point came from;
+``st.init`` makes that companion the series' x-axis via
+``wandb.define_metric``, so extremes keep their original position.
+``group: N`` folds keys onto their first *N* dotted components (after the
+last ``/``) and combines them with ``reduce`` (max | min | mean | sum |
+norm); ``max_series`` drops new series past the cap.  Without ``horizon``
+each series passes through until it has spent half its budget, then the
+bucket width doubles every further half-budget, so the point count grows
+only logarithmically with run length.
+"""
+from __future__ import annotations
+from collections import deque
+from fnmatch import fnmatchcase
+from numbers import Real
+from typing import Mapping, Any, Callable
+import math, threading
+
+METHODS = ("minmax", "lttb", "none")
+STEP_PREFIX = "_step/"  # companion x-axis key of each downsampled series
+
+_REDUCE = {
+    "max": max,
+    "min": min,
+    "sum": sum,
+    "mean": lambda vs: sum(vs) / len(vs),
+    "norm": lambda vs: math.sqrt(sum(v * v for v in vs)),
+}
+
+
+class _Rule:
+    def __init__(self, match: str = "*", budget: int = 1000, method: str = "minmax",
+                 horizon: int | None = None, group: int | None = None,
+                 reduce: str = "max", max_series: int | None = None):
+        if method not in METHODS:
+            raise ValueError(f"Unknown downsample method {method!r}")
+        if reduce not in _REDUCE:
+            raise ValueError(f"Unknown downsample reduce {reduce!r}")
+        self.match, self.budget, self.method = match, max(int(budget), 2), method
+        self.horizon, self.group, self.max_series = horizon, group, max_series
+        self.reduce = _REDUCE[reduce]
+        self.n_series = 0
+        self.warned = False
+
+    def group_key(self, key: str) -> str:
+        if not self.group:
+            return key
+        head, sep, tail = key.rpartition("/")
+        return head + sep + ".".join(tail.split(".")[:self.group])
+
+    def width(self) -> int:
+        """Fixed bucket width in steps, or 0 to adapt (see module docstring)."""
+        if not self.horizon:
+            return 0
+        per_bucket = 3 if self.method == "minmax" else 2  # + the bucket's first point
+        return max(1, math.ceil(self.horizon * per_bucket / self.budget))
+
+
+class _Series:
+    __slots__ = ("rule", "width", "adaptive", "bucket", "bucket_end", "held",
+                 "prev", "pending", "emitted", "first", "count")
+
+    def __init__(self, rule: _Rule):
+        self.rule = rule
+        self.width = rule.width()
+        self.adaptive = self.width == 0
+        self.bucket: list[tuple[int, float]] = []
+        self.bucket_end = 0
+        self.held: list[tuple[int, float]] = []  # lttb: awaiting next bucket
+        self.prev: tuple[int, float] | None = None
+        self.pending: deque[tuple[int, float]] = deque()
+        self.emitted = 0
+        self.first: int | None = None
+        self.count = 0
+
+    def push(self, step: int, value: float) -> tuple[int, float] | None:
+        """Ingest one point; return a buffered ``(step, value)`` to log, if any."""
+        self.count += 1
+        if self.first is None:
+            self.first = step
+        if self.width == 0:  # pass-through phase of adaptive mode
+            self.emitted += 1
+            self.prev = (step, value)
+            if self.emitted >= self.rule.budget // 2 and self.count > 1:
+                gap = (step - self.first) / (self.count - 1)
+                self.width = max(2, math.ceil(2 * gap))
+                self.emitted = 0
+            return step, value
+        if self.bucket and step >= self.bucket_end:
+            self._close()
+        if not self.bucket:  # log a bucket's first point right away
+            self.bucket_end = step + self.width
+            self.pending.append((step, value))
+            self.emitted += 1
+        self.bucket.append((step, value))
+        return self.pending.popleft() if self.pending else None
+
+    def flush(self) -> list[tuple[int, float]]:
+        if self.bucket:
+            self._close()
+        if self.held:
+            self._select(self.held, self.held[-1])
+            self.held = []
+        out = list(self.pending)
+        self.pending.clear()
+        return out
+
+    def _close(self):
+        bucket, self.bucket = self.bucket, []
+        if self.rule.method == "minmax":
+            lo = min(bucket, key=lambda p: p[1])
+            hi = max(bucket, key=lambda p: p[1])
+            picks = [lo] if lo is hi else sorted((lo, hi))
+            self.prev = picks[-1]
+            picks = [p for p in picks if p is not bucket[0]]  # already logged
+            self.pending.extend(picks)
+            self.emitted += len(picks)
+        else:
+            if self.held:
+                n = len(bucket)
+                avg = (sum(p[0] for p in bucket) / n, sum(p[1] for p in bucket) / n)
+                self._select(self.held, avg)
+            self.held = bucket
+        if self.adaptive and self.emitted >= self.rule.budget // 2:
+            self.width *= 2
+            self.emitted = 0
+
+    def _select(self, bucket, nxt):
+        """Largest-Triangle-Three-Buckets pick from *bucket*."""
+        if self.prev is None:
+            pick = bucket[0]
+        else:
+            (x0, y0), (x2, y2) = self.prev, nxt
+            pick = max(bucket, key=lambda p: abs((x0 - x2) * (p[1] - y0)
+                                                 - (x0 - p[0]) * (y2 - y0)))
+        self.prev = pick
+        if pick is not bucket[0]:  # the first point was logged on arrival
+            self.pending.append(pick)
+            self.emitted += 1
+
+
+class Downsampler:
+    """Stateful filter: ``data = ds(data, step)`` before every ``wandb.log``.
+
+    *on_series* is called with each new series key (to define its x-axis).
+    Calls are serialised, so ``monitor`` may log from its own thread.
+    """
+
+    def __init__(self, budget: int = 1000, method: str = "minmax",
+                 horizon: int | None = None, rules=(),
+                 on_series: Callable[[str], Any] | None = None):
+        defaults = {"budget": budget, "method": method, "horizon": horizon}
+        self.rules = [_Rule(**{**defaults, **dict(r)}) for r in rules]
+        self.rules.append(_Rule(**defaults))
+        self._rule_for: dict[str, _Rule | None] = {}
+        self._series: dict[str, _Series | None] = {}
+        self._on_series = on_series
+        self._lock = threading.Lock()
+
+    def set_horizon(self, horizon: int):
+        """Set the horizon for rules that have none (used by the HF callback)."""
+        for rule in self.rules:
+            rule.horizon = rule.horizon or horizon
+
+    def _rule(self, key: str) -> _Rule | None:
+        if key not in self._rule_for:
+            rule = next(r for r in self.rules if fnmatchcase(key, r.match))
+            self._rule_for[key] = None if rule.method == "none" else rule
+        return self._rule_for[key]
+
+    def _get_series(self, key: str, rule: _Rule) -> _Series | None:
+        if key not in self._series:
+            if rule.max_series is not None and rule.n_series >= rule.max_series:
+                if not rule.warned:
+                    print(f"[SkyTrack] >{rule.max_series} series match "
+                          f"{rule.match!r}; dropping new keys such as {key!r}")
+                    rule.warned = True
+                self._series[key] = None
+            else:
+                rule.n_series += 1
+                self._series[key] = _Series(rule)
+                if self._on_series is not None:
+                    self._on_series(key)
+        return self._series[key]
+
+    def __call__(self, data: Mapping[str, Any], step: int) -> dict[str, Any]:
+        with self._lock:
+            return self._filter(data, step)
+
+    def _filter(self, data: Mapping[str, Any], step: int) -> dict[str, Any]:
+        out: dict[str, Any] = {}
+        groups: dict[str, tuple[_Rule, list[float]]] = {}
+        for key, value in data.items():
+            rule = self._rule(key)
+            if rule is None or isinstance(value, bool) or not isinstance(value, Real):
+                out[key] = value
+                continue
+            groups.setdefault(rule.group_key(key), (rule, []))[1].append(float(value))
+        for key, (rule, values) in groups.items():
+            series = self._get_series(key, rule)
+            if series is None:
+                continue
+            point = series.push(step, values[0] if len(values) == 1 else rule.reduce(values))
+            if point is not None:
+                out[STEP_PREFIX + key], out[key] = point
+        return out
+
+    def flush(self) -> list[dict[str, float]]:
+        """Drain all buffered points as a list of rows (one value per key per row)."""
+        rows: list[dict[str, float]] = []
+        with self._lock:
+            for key, series in self._series.items():
+                if series is None:
+                    continue
+                for i, (step, value) in enumerate(series.flush()):
+                    if i == len(rows):
+                        rows.append({})
+                    rows[i][STEP_PREFIX + key], rows[i][key] = step, value
+        return rows
+
+
+def from_config(cfg: Mapping[str, Any], on_series=None) -> Downsampler | None:
+    """Build a downsampler from ``cfg["downsample"]`` (``True`` → defaults)."""
+    spec = cfg.get("downsample")
+    if not spec:
+        return None
+    return Downsampler(**({} if spec is True else dict(spec)), on_series=on_series)
@@ -1,9 +1,16 @@
 """Core helpers for W&B run initialisation and lightweight metric logging."""
 from __future__ import annotations
 from typing import Mapping, Any
-import subprocess, os, wandb
+import atexit, subprocess, os, threading, weakref, wandb
+from . import profiler as _profiler, downsample as _downsample, spool as _spool
 
 _RUN = None  # singleton to avoid duplicate init() calls
+_PROFILER = None  # StepProfiler when cfg["profile"] / $SKYTRACK_PROFILE is set
+_DOWNSAMPLER = None  # Downsampler when cfg["downsample"] is set
+_SPOOL = None  # Spool when cfg["spool"] is set
+_STATS = weakref.WeakKeyDictionary()  # model -> stats.ModelStats
+_UNCOMMITTED: dict = {}  # commit=False rows awaiting the next spooled row
+_UNCOMMITTED_LOCK = threading.Lock()
 
 # --------------------------------------------------------------------- #
 # Utilities                                                              #
@@ -30,14 +37,17 @@ def init(cfg: Mapping[str, Any] | None = None):
     ----------
     cfg
         Any mapping (dict, OmegaConf) of parameters. Contents are
-        forwarded to W&B ``run.config`` for easy filtering.
+        forwarded to W&B ``run.config`` for easy filtering. An optional
+        ``profile`` entry enables :mod:`skytrack.profiler`, a ``downsample``
+        entry enables :mod:`skytrack.downsample`, a ``spool`` entry enables
+        :mod:`skytrack.spool`. ``run_id`` resumes (or creates) that run.
 
     Returns
     -------
     wandb.sdk.wandb_run.Run
         The active W&B run.
     """
-    global _RUN
+    global _RUN, _PROFILER, _DOWNSAMPLER, _SPOOL
     if _RUN is not None:
         return _RUN
 
@@ -48,11 +58,43 @@ def init(cfg: Mapping[str, Any] | None = None):
         project=cfg.get("project", "skytrack"),
         entity=cfg.get("entity"),
         name=cfg.get("run_name"),
+        id=cfg.get("run_id"),
+        resume="allow" if cfg.get("run_id") else None,
         config=cfg,
     )
     _setup_dashboard()
+    _PROFILER = _profiler.from_config(cfg)
+    _DOWNSAMPLER = _downsample.from_config(cfg, on_series=_define_series)
+    _SPOOL = _spool.from_config(cfg, _RUN)
+    _before_finish(_RUN, _shutdown)
     return _RUN
 
+def _before_finish(run, fn):
+    """Call *fn* at the start of ``run.finish()``, or at exit if it never comes."""
+    atexit.register(fn)  # after wandb.init, so it runs before wandb's own hook
+    try:
+        from wandb.sdk.wandb_run import TeardownHook, TeardownStage
+        run._teardown_hooks.append(TeardownHook(call=fn, stage=TeardownStage.EARLY))
+    except (ImportError, AttributeError):  # other wandb versions: atexit only
+        pass
+
+def _shutdown():
+    """Close the profiler, flush, then close the spool – in that order.
+
+    The profiler's summary goes through ``st.log`` and the spool must
+    drain while the run still accepts rows, so this replaces relying on
+    separate ``atexit`` hooks (which run in reverse registration order).
+    """
+    global _PROFILER, _SPOOL
+    if _PROFILER is not None:
+        _PROFILER.close()
+        _PROFILER = None
+    if wandb.run is not None:
+        flush()
+    if _SPOOL is not None:
+        _SPOOL.close(drain=False)  # drained by flush(); any rest stays on disk
+        _SPOOL = None
+
 # --------------------------------------------------------------------- #
 # Dashboard & metric helpers                                             #
 # --------------------------------------------------------------------- #
@@ -67,8 +109,51 @@ def _setup_dashboard():
     # Learning rate: keep last value
     wandb.define_metric("lr*", summary="last")
 
-# Shorthand alias: st.log({...}) is same as wandb.log({...})
-log = wandb.log
+def _define_series(key: str):
+    """Plot a downsampled series against the steps its points came from."""
+    x = _downsample.STEP_PREFIX + key
+    wandb.define_metric(x, hidden=True)
+    wandb.define_metric(key, step_metric=x)
+
+def _emit(data: Mapping[str, Any], step: int | None = None, commit: bool | None = None):
+    """Hand a (downsampled) row to the spool or straight to ``wandb.log``."""
+    if _SPOOL is not None:
+        # mirror wandb.log: commit=False rows merge into the next committed one
+        with _UNCOMMITTED_LOCK:
+            if commit is False:
+                _UNCOMMITTED.update(data)
+                return
+            data = {**_UNCOMMITTED, **data}
+            _UNCOMMITTED.clear()
+        if data:
+            _SPOOL.append(data, step)
+        return
+    wandb.log(data, step=step, commit=commit)
+
+def log(data: Mapping[str, Any], step: int | None = None, commit: bool | None = None):
+    """Drop-in for ``wandb.log`` that applies the configured downsampler.
+
+    With a spool the row is only appended locally; ``commit=False`` rows
+    are held back and merged into the next committed one.
+    """
+    if _DOWNSAMPLER is not None and data:
+        data = _DOWNSAMPLER(data, step if step is not None else wandb.run.step)
+        if not data and not commit:
+            return
+    _emit(data, step, commit)
+
+def flush():
+    """Emit buffered downsampler points and drain the spool.
+
+    Runs automatically before ``run.finish()``; call it yourself to log
+    the tail of every series earlier.
+    """
+    if _DOWNSAMPLER is not None and wandb.run is not None:
+        for row in _DOWNSAMPLER.flush():
+            _emit(row)
+    if _SPOOL is not None:
+        _emit({})  # commit any row still held back by commit=False
+        _SPOOL.drain()
 
 def log_gradients(model, step: int, every: int = 100):
     """Log L2‑norm of gradients every *every* steps."""
@@ -79,9 +164,38 @@ def log_gradients(model, step: int, every: int = 100):
         for n, p in model.named_parameters() if p.grad is not None
     }
     if grads:
-        wandb.log(grads, step=step)
+        log(grads, step=step)
+
+def log_model_stats(model, step: int, every: int = 100,
+                    layers: int = 8, bins: int = 64, max_elements: int = 1 << 22):
+    """Log sampled gradient/weight statistics every *every* steps.
+
+    Call every step after ``optimizer.step()``: the step before a logging
+    step snapshots the weights so ``update_ratio/*`` covers one update.
+    Each logging step covers the next *layers* parameter tensors, up to
+    *max_elements* elements (histograms, max-abs, zero/NaN/Inf fractions),
+    with one host transfer.  Changing *layers*, *bins* or *max_elements*
+    between calls restarts the rotation.
+    """
+    sampler = _STATS.get(model)
+    if sampler is None or (sampler.layers, sampler.bins, sampler.max_elements) \
+            != (layers, bins, max_elements):
+        from .stats import ModelStats
+        sampler = _STATS[model] = ModelStats(model, layers=layers, bins=bins,
+                                             max_elements=max_elements)
+    if step % every == 0:
+        stats = sampler.collect(step)
+        if stats:
+            log(stats, step=step)
+    if (step + 1) % every == 0:
+        sampler.snapshot(step)
 
 def log_lr(optimizer, step: int):
     """Log learning‑rate(s) of an optimizer."""
     for i, group in enumerate(optimizer.param_groups):
-        wandb.log({f"lr/group_{i}": group["lr"]}, step=step)
+        log({f"lr/group_{i}": group["lr"]}, step=step)
+
+def profile_step(step: int):
+    """Mark the start of *step* for the configured profiler (no-op if off)."""
+    if _PROFILER is not None:
+        _PROFILER.step(step)
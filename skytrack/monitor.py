@@ -1,5 +1,6 @@
 """Optional system‑metric helpers (GPU utilisation, memory, CPU)."""
-import wandb, psutil, time, threading, torch
+import psutil, time, threading, torch
+from .logging import log
 
 def _gpu_stats():
     if not torch.cuda.is_available():
@@ -22,7 +23,7 @@ def start_background(interval: float = 30.0):
             stats.update(_gpu_stats())
             stats.update(_sys_stats())
             if stats:
-                wandb.log(stats)
+                log(stats)
             time.sleep(interval)
     t = threading.Thread(target=loop, daemon=True)
     t.start()
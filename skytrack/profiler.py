@@ -0,0 +1,177 @@
+"""Config-driven ``torch.profiler`` windows that report to the active W&B run.
+
+Enable via ``st.init({"profile": {...}})`` or the ``SKYTRACK_PROFILE`` env
+var (which wins, so sweep engines can switch it on per job)::
+
+    SKYTRACK_PROFILE=500-510                      # fixed window
+    SKYTRACK_PROFILE='{"anomaly": 2.0}'           # trigger on slow steps
+
+Keys: ``steps`` ("500-510"), ``top_n`` (20), ``anomaly`` (step-time factor
+over the running mean that arms a capture), ``anomaly_window`` (10),
+``anomaly_max`` (3), ``dir`` ("skytrack_profiles").
+
+Call ``st.profile_step(step)`` once at the *start* of every training step;
+``SkyTrackCallback`` does this for you.
+"""
+from __future__ import annotations
+from pathlib import Path
+from typing import Mapping, Any
+import atexit, json, os, time, wandb
+
+ENV_VAR = "SKYTRACK_PROFILE"
+
+_EMA_ALPHA = 0.1
+_EMA_WARMUP = 10  # step-time samples before anomaly detection kicks in
+
+
+def _parse_window(spec) -> tuple[int, int]:
+    """Parse ``"500-510"``, ``"500:510"``, ``"500"`` or ``[500, 510]``."""
+    if isinstance(spec, (list, tuple)):
+        start, end = spec
+    elif isinstance(spec, int):
+        start = end = spec
+    else:
+        parts = str(spec).replace(":", "-").split("-")
+        if len(parts) == 1:
+            parts = parts * 2
+        start, end = parts
+    start, end = int(start), int(end)
+    if end < start:
+        raise ValueError(f"Empty profile window {spec!r}")
+    return start, end
+
+
+def _device_time(evt) -> float:
+    # ``cuda_time_total`` was renamed to ``device_time_total`` in torch 2.4
+    return getattr(evt, "device_time_total", getattr(evt, "cuda_time_total", 0.0))
+
+
+class StepProfiler:
+    """Run ``torch.profiler`` over selected step windows and upload results."""
+
+    def __init__(self, steps=None, top_n: int = 20,
+                 anomaly: float | None = None, anomaly_window: int = 10,
+                 anomaly_max: int = 3, dir: str | Path = "skytrack_profiles"):
+        self.window = _parse_window(steps) if steps is not None else None
+        self.top_n = top_n
+        self.anomaly = anomaly
+        self.anomaly_window = anomaly_window
+        self.anomaly_left = anomaly_max
+        self.dir = Path(dir)
+
+        self._prof = None
+        self._active: tuple[int, int] | None = None
+        self._last_t: float | None = None
+        self._ema: float | None = None
+        self._seen = 0
+        atexit.register(self.close)
+
+    # ----------------------------------------------------------------- #
+    def step(self, step: int):
+        """Mark the start of training step *step*."""
+        now = time.perf_counter()
+        if self._last_t is not None and self._prof is None:
+            self._observe(now - self._last_t, step)
+
+        if self._prof is not None:
+            if step > self._active[1]:
+                self._stop()
+            else:
+                self._prof.step()
+        if self._prof is None and self.window and self.window[0] <= step <= self.window[1]:
+            self._start(step, self.window[1])
+            self.window = None
+        elif self.window and step > self.window[1]:
+            self.window = None  # e.g. resumed past it; re-enables anomaly mode
+        # restart the clock so profiler start/stop cost is not a "slow step"
+        self._last_t = time.perf_counter()
+
+    def close(self):
+        """Flush a still-open window (end of training / interpreter exit)."""
+        if self._prof is not None:
+            self._stop()
+
+    # ----------------------------------------------------------------- #
+    def _observe(self, dt: float, step: int):
+        self._seen += 1
+        if (self.anomaly and self.anomaly_left > 0 and self.window is None
+                and self._seen > _EMA_WARMUP and dt > self.anomaly * self._ema):
+            print(f"[SkyTrack] step time {dt:.3f}s > {self.anomaly:g}× mean "
+                  f"{self._ema:.3f}s – profiling steps {step}-{step + self.anomaly_window - 1}")
+            self.anomaly_left -= 1
+            self.window = (step, step + self.anomaly_window - 1)
+        self._ema = dt if self._ema is None else _EMA_ALPHA * dt + (1 - _EMA_ALPHA) * self._ema
+
+    def _start(self, start: int, end: int):
+        import torch
+        from torch.profiler import profile, schedule, ProfilerActivity
+        activities = [ProfilerActivity.CPU]
+        if torch.cuda.is_available():
+            activities.append(ProfilerActivity.CUDA)
+        # without a schedule torch records no ProfilerStep#k markers
+        self._prof = profile(activities=activities,
+                             schedule=schedule(wait=0, warmup=0, active=end - start + 1))
+        self._prof.start()
+        self._active = (start, end)
+
+    def _stop(self):
+        prof, (start, end) = self._prof, self._active
+        self._prof = self._active = None
+        prof.stop()
+
+        self.dir.mkdir(parents=True, exist_ok=True)
+        trace = self.dir / f"trace_steps{start}-{end}.json"
+        prof.export_chrome_trace(str(trace))
+
+        # torch renames every ProfilerStep#k to "ProfilerStep*", so the k-th
+        # marker by start time is step start + k
+        steps = sorted((e for e in prof.events() if e.name.startswith("ProfilerStep")),
+                       key=lambda e: e.time_range.start)
+        ops = [e for e in prof.key_averages() if not e.key.startswith("ProfilerStep")]
+        has_device = any(_device_time(e) for e in ops)
+        ops.sort(key=_device_time if has_device else (lambda e: e.cpu_time_total),
+                 reverse=True)
+
+        if wandb.run is None:
+            print(f"[SkyTrack] profile trace → {trace} (no active W&B run)")
+            return
+        per_step = wandb.Table(columns=["step", "cpu_ms", "cuda_ms"])
+        for k, e in enumerate(steps):
+            per_step.add_data(start + k, e.cpu_time_total / 1e3, _device_time(e) / 1e3)
+        top = wandb.Table(columns=["op", "calls", "cpu_total_ms", "self_cpu_ms",
+                                   "cuda_total_ms"])
+        for e in ops[:self.top_n]:
+            top.add_data(e.key, e.count, e.cpu_time_total / 1e3,
+                         e.self_cpu_time_total / 1e3, _device_time(e) / 1e3)
+        n = max(len(steps), 1)
+        # commit=False: attach to the caller's current step, never advance it;
+        # st.log so a spool keeps the training thread off the network
+        from . import logging as st
+        st.log({
+            "profile/step_cpu_ms": sum(e.cpu_time_total for e in steps) / n / 1e3,
+            "profile/step_cuda_ms": sum(_device_time(e) for e in steps) / n / 1e3,
+            "profile/steps": per_step,
+            "profile/top_ops": top,
+        }, commit=False)
+
+        art = wandb.Artifact(f"profile-{wandb.run.id}", type="profile")
+        art.add_file(str(trace))
+        wandb.run.log_artifact(art, aliases=[f"steps-{start}-{end}"])
+        print(f"[SkyTrack] Logged profile of steps {start}-{end} → W&B")
+
+
+def env_value(spec) -> str:
+    """Serialise a ``profile`` spec for ``$SKYTRACK_PROFILE``."""
+    return json.dumps(spec) if isinstance(spec, (dict, list)) else str(spec)
+
+
+def from_config(cfg: Mapping[str, Any]) -> StepProfiler | None:
+    """Build a profiler from ``cfg["profile"]`` / ``$SKYTRACK_PROFILE``."""
+    spec = os.environ.get(ENV_VAR) or cfg.get("profile")
+    if not spec:
+        return None
+    if isinstance(spec, str) and spec.lstrip()[:1] in ("{", "["):
+        spec = json.loads(spec)
+    if not isinstance(spec, Mapping):
+        spec = {"steps": spec}
+    return StepProfiler(**dict(spec))
@@ -0,0 +1,321 @@
+"""Crash-safe local write-ahead spool for metrics.
+
+Enable via ``st.init({"spool": {...}})`` (``True`` → defaults)::
+
+    spool:
+      dir: .skytrack_spool      # one sub-directory per W&B run id
+      segment_bytes: 16777216   # rotate segments at 16 MiB
+      max_bytes: 1073741824     # drop the oldest backlog beyond 1 GiB
+      fsync_interval: 2.0       # seconds between fsyncs
+      upload_interval: 1.0      # seconds between uploader passes
+
+``st.log`` then only appends a compact binary record to the current
+segment; a daemon thread tails the segments and hands rows to
+``wandb.log`` in bulk, so training never waits on the network.  Segments
+that were not uploaded (network loss, preempted VM) are replayed by the
+next ``st.init`` with the same ``run_id``; steps the resumed run already
+has are skipped.
+
+Record layout: ``<type:u8><len:u32><payload><crc32:u32>`` where a KEY
+record interns ``<id:u32><utf-8 name>`` per segment and a ROW record is
+``<step:i64><n:u32>`` followed by *n* ``<id:u32><value:f64>`` pairs.
+Non-numeric values (tables, histograms) are kept in memory and merged
+back when their row is uploaded; they are not crash-safe.
+"""
+from __future__ import annotations
+from pathlib import Path
+from numbers import Real
+from typing import Mapping, Any, Callable, Iterator
+import atexit, json, os, struct, threading, time, zlib, wandb
+
+_HDR = struct.Struct("<BI")   # record type, payload length
+_CRC = struct.Struct("<I")
+_KEY = struct.Struct("<I")    # key id (+ utf-8 name)
+_ROW = struct.Struct("<qI")   # step, item count
+_ITEM = struct.Struct("<Id")  # key id, value
+_T_KEY, _T_ROW = 1, 2
+_NO_STEP = -1
+
+
+def _record(kind: int, payload: bytes) -> bytes:
+    return _HDR.pack(kind, len(payload)) + payload + _CRC.pack(zlib.crc32(payload))
+
+
+def _seg_path(root: Path, idx: int) -> Path:
+    return root / f"seg-{idx:06d}.bin"
+
+
+def _seg_index(path: Path) -> int:
+    return int(path.stem.split("-")[1])
+
+
+def read_segment(path: str | Path, start: int = 0, end: int | None = None,
+                 keys: dict[int, str] | None = None,
+                 pos: int = 0) -> Iterator[tuple[int, int | None, dict]]:
+    """Yield ``(end_offset, step, row)`` for ROW records at or after *start*.
+
+    Parsing begins at record boundary *pos* with the names already in
+    *keys*, so a tailing reader can pass both back from an earlier call
+    instead of re-reading the segment head.  Stops silently at the first
+    truncated or corrupt record (torn tail).
+    """
+    keys = {} if keys is None else keys
+    with open(path, "rb") as fh:
+        fh.seek(pos)
+        data = memoryview(fh.read(-1 if end is None else max(end - pos, 0)))
+    at = 0
+    while at + _HDR.size <= len(data):
+        kind, n = _HDR.unpack_from(data, at)
+        body = at + _HDR.size
+        stop = body + n + _CRC.size
+        if stop > len(data) or zlib.crc32(data[body:body + n]) != _CRC.unpack_from(data, body + n)[0]:
+            return
+        payload = data[body:body + n]
+        if kind == _T_KEY:
+            keys[_KEY.unpack_from(payload)[0]] = bytes(payload[_KEY.size:]).decode()
+        elif kind == _T_ROW and pos + at >= start:
+            step, _ = _ROW.unpack_from(payload)
+            row = {keys[k]: v for k, v in _ITEM.iter_unpack(payload[_ROW.size:])}
+            yield pos + stop, (None if step == _NO_STEP else step), row
+        at = stop
+
+
+class Spool:
+    """Append-only segmented metric log with a background uploader."""
+
+    def __init__(self, root: str | Path, segment_bytes: int = 16 << 20,
+                 max_bytes: int = 1 << 30, fsync_interval: float = 2.0,
+                 upload_interval: float = 1.0, min_step: int | None = None,
+                 log_fn: Callable[..., Any] | None = None):
+        self.dir = Path(root)
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self.segment_bytes, self.max_bytes = segment_bytes, max_bytes
+        self.fsync_interval, self.upload_interval = fsync_interval, upload_interval
+        self._log = log_fn or wandb.log
+
+        existing = sorted(_seg_index(p) for p in self.dir.glob("seg-*.bin"))
+        self._seg = existing[-1] + 1 if existing else 0  # never reopen a torn file
+        self._replay_below = self._seg  # segments from a previous session
+        self._min_step = min_step
+        self._cursor = self._load_cursor(existing[0]) if existing else (0, 0)
+
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closed = False
+        self._failures = 0
+        self._dropped = 0
+        self._extras: dict[tuple[int, int], dict] = {}
+        self._parsed: tuple[int, dict[int, str], int] = (-1, {}, 0)  # seg, keys, offset
+        self._open()
+        self._thread = threading.Thread(target=self._loop, daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    # ----------------------------------------------------------------- #
+    # Writer side (training thread)                                      #
+    # ----------------------------------------------------------------- #
+    def append(self, data: Mapping[str, Any], step: int | None = None):
+        """Spool one ``wandb.log``-style row; never touches the network."""
+        numeric, extras = {}, {}
+        for k, v in data.items():
+            if isinstance(v, Real) and not isinstance(v, bool):
+                numeric[k] = float(v)
+            else:
+                extras[k] = v
+        with self._lock:
+            if self._closed:  # e.g. a monitor thread logging after shutdown
+                if not self._dropped:
+                    print(f"[SkyTrack] spool closed – dropping rows such as {sorted(data)}")
+                self._dropped += 1
+                return
+            buf = bytearray()
+            for k in numeric:
+                if k not in self._keys:
+                    self._keys[k] = len(self._keys)
+                    buf += _record(_T_KEY, _KEY.pack(self._keys[k]) + k.encode())
+            buf += _record(_T_ROW, _ROW.pack(_NO_STEP if step is None else step, len(numeric))
+                           + b"".join(_ITEM.pack(self._keys[k], v) for k, v in numeric.items()))
+            self._fh.write(buf)
+            self._size += len(buf)
+            if extras:
+                self._extras[(self._seg, self._size)] = extras
+            if self._size >= self.segment_bytes:
+                self._rotate()
+
+    def _open(self):
+        self._fh = open(_seg_path(self.dir, self._seg), "ab")
+        self._keys: dict[str, int] = {}
+        self._size = 0
+        self._committed = (self._seg, 0)
+        self._last_fsync = time.monotonic()
+
+    def _sync(self, fsync: bool = False):
+        """Flush buffered records; caller holds the lock.
+
+        Returns the file when an fsync is due, so the caller can run it
+        after releasing the lock instead of blocking ``append`` on disk.
+        """
+        self._fh.flush()
+        self._committed = (self._seg, self._size)
+        if fsync or time.monotonic() - self._last_fsync >= self.fsync_interval:
+            self._last_fsync = time.monotonic()
+            return self._fh
+        return None
+
+    @staticmethod
+    def _fsync(fh):
+        if fh is None:
+            return
+        try:
+            os.fsync(fh.fileno())
+        except (OSError, ValueError):  # rotated meanwhile; _rotate synced it
+            pass
+
+    def _rotate(self):
+        self._fsync(self._sync(fsync=True))
+        self._fh.close()
+        self._seg += 1
+        self._open()
+        self._enforce_budget()
+
+    def _enforce_budget(self):
+        segs = sorted(self.dir.glob("seg-*.bin"))
+        total = sum(p.stat().st_size for p in segs)
+        for path in segs[:-1]:
+            if total <= self.max_bytes:
+                break
+            idx = _seg_index(path)
+            if idx >= self._cursor[0]:
+                print(f"[SkyTrack] spool over {self.max_bytes} B – dropping un-uploaded {path.name}")
+                self._cursor = (idx + 1, 0)
+            total -= path.stat().st_size
+            path.unlink(missing_ok=True)
+
+    # ----------------------------------------------------------------- #
+    # Uploader side (daemon thread)                                      #
+    # ----------------------------------------------------------------- #
+    def _load_cursor(self, default: int) -> tuple[int, int]:
+        try:
+            cur = json.loads((self.dir / "cursor.json").read_text())
+            return max(cur["segment"], default), cur["offset"] if cur["segment"] >= default else 0
+        except (FileNotFoundError, ValueError, KeyError):
+            return default, 0
+
+    def _save_cursor(self):
+        tmp = self.dir / "cursor.json.tmp"
+        tmp.write_text(json.dumps({"segment": self._cursor[0], "offset": self._cursor[1]}))
+        os.replace(tmp, self.dir / "cursor.json")
+
+    def _upload_once(self) -> bool:
+        """Upload everything committed so far; ``False`` if ``log_fn`` failed."""
+        with self._lock:
+            due = self._sync()
+            committed = self._committed
+        self._fsync(due)
+        while True:
+            with self._lock:
+                seg, off = self._cursor
+            if (seg, off) >= committed:
+                return True
+            path = _seg_path(self.dir, seg)
+            end = committed[1] if seg == committed[0] else None
+            last, step, batch, offsets = off, None, {}, []
+            if self._parsed[0] != seg:
+                self._parsed = (seg, {}, 0)
+            _, keys, parsed = self._parsed
+            try:
+                # keys holds every name up to `parsed`, so resume parsing there
+                for last, rstep, row in read_segment(path, off, end, keys, min(parsed, off)):
+                    self._parsed = (seg, keys, max(last, parsed))
+                    if seg < self._replay_below and self._min_step is not None \
+                            and rstep is not None and rstep < self._min_step:
+                        continue
+                    # coalesce consecutive rows of the same step into one call
+                    if batch and (rstep != step or rstep is None):
+                        self._send(seg, batch, step, offsets)
+                        batch, offsets = {}, []
+                    row.update(self._extras.get((seg, last), {}))
+                    offsets.append(last)
+                    step = rstep
+                    batch.update(row)
+                if batch:
+                    self._send(seg, batch, step, offsets)
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                print(f"[SkyTrack] spool upload failed, will retry: {e}")
+                self._failures += 1
+                with self._lock:
+                    self._save_cursor()  # keep the batches that did go out
+                return False
+            with self._lock:
+                if self._cursor[0] != seg:  # budget enforcement moved past us
+                    continue
+                if seg < committed[0]:
+                    self._cursor = (seg + 1, 0)
+                    path.unlink(missing_ok=True)
+                else:
+                    self._cursor = (seg, end if end is not None else last)
+                self._save_cursor()
+
+    def _send(self, seg: int, batch: dict, step: int | None, offsets: list[int]):
+        """Log one batch, then move the cursor past it and release its extras."""
+        self._log(batch, step=step)
+        with self._lock:
+            for off in offsets:
+                self._extras.pop((seg, off), None)
+            if self._cursor[0] == seg:
+                self._cursor = (seg, offsets[-1])
+
+    def _loop(self):
+        while not self._closed:
+            self._upload_once()
+            self._wake.wait(self.upload_interval)
+            self._wake.clear()
+
+    # ----------------------------------------------------------------- #
+    def drain(self, timeout: float = 30.0) -> bool:
+        """Block until everything appended so far is uploaded.
+
+        Gives up after *timeout* or the first failed upload; whatever is left
+        stays on disk for the next session.
+        """
+        with self._lock:
+            due = self._sync()
+            target = self._committed
+        self._fsync(due)
+        failures = self._failures
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline and self._failures == failures:
+            with self._lock:
+                if self._cursor >= target:
+                    return True
+            self._wake.set()
+            time.sleep(0.05)
+        return False
+
+    def close(self, drain: bool = True):
+        """Stop the uploader and fsync the active segment."""
+        if self._closed:
+            return
+        if drain:
+            self.drain()
+        self._closed = True
+        self._wake.set()
+        self._thread.join(timeout=5.0)
+        with self._lock:
+            self._fsync(self._sync(fsync=True))
+            self._fh.close()
+            if self._cursor >= self._committed:  # nothing left to replay
+                _seg_path(self.dir, self._seg).unlink(missing_ok=True)
+                (self.dir / "cursor.json").unlink(missing_ok=True)
+
+
+def from_config(cfg: Mapping[str, Any], run) -> Spool | None:
+    """Build a spool for *run* from ``cfg["spool"]``."""
+    spec = cfg.get("spool")
+    if not spec:
+        return None
+    spec = {} if spec is True else dict(spec)
+    root = Path(spec.pop("dir", ".skytrack_spool")) / run.id
+    return Spool(root, min_step=run.step if run.resumed else None, **spec)
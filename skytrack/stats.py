@@ -0,0 +1,135 @@
+"""Sampled on-device gradient / weight statistics (cheap ``wandb.watch``).
+
+Each logging step visits a rotating window of *layers* parameter tensors
+(capped at *max_elements* elements), so the cost is fixed regardless of
+model size.  The window is flattened into one buffer with per-element
+segment ids and reduced with ``scatter_reduce`` / ``index_add_``, so a
+handful of kernels and a single host transfer cover the whole step.
+"""
+from __future__ import annotations
+import torch, wandb
+
+_SCALARS = ("max_abs", "zero_frac", "nan_frac", "inf_frac")
+
+
+def _segments(tensors) -> tuple[torch.Tensor, torch.Tensor, torch.Tensor]:
+    """Flatten *tensors* into one float buffer plus per-element segment ids."""
+    dev = tensors[0].device
+    x = torch.cat([t.detach().float().flatten().to(dev) for t in tensors])
+    sizes = torch.tensor([t.numel() for t in tensors], device=dev)
+    # output_size spares a device sync; segments are contiguous, so this is
+    # also how per-tensor values are broadcast back (cheaper than a gather)
+    seg = torch.arange(len(tensors), device=dev).repeat_interleave(sizes, output_size=x.numel())
+    return x, seg, sizes
+
+
+def _describe(tensors, bins: int) -> torch.Tensor:
+    """One ``[max_abs, zero, nan, inf fractions, lo, hi, *counts]`` row per tensor.
+
+    The tensors share one buffer, so the kernel count does not grow with
+    the window.
+    """
+    x, seg, sizes = _segments(tensors)
+    n = len(tensors)
+    finite = x.isfinite()
+    inf = torch.full((n,), float("inf"), device=x.device)
+    # range over finite values only, so a stray NaN/Inf does not pull in 0
+    lo = inf.scatter_reduce(0, seg, torch.where(finite, x, float("inf")), "amin")
+    hi = (-inf).scatter_reduce(0, seg, torch.where(finite, x, float("-inf")), "amax")
+    none = lo > hi  # no finite element at all
+    lo, hi = lo.masked_fill(none, 0.0), hi.masked_fill(none, 0.0)
+    # one counting pass: finite values land in their bin (torch.histc would
+    # need host-side bounds, i.e. a device sync per tensor), zeros / NaN /
+    # Inf in three extra slots; zeros are folded back into their bin below
+    scale = bins / (hi - lo).clamp_min(1e-12)
+    per_elem = lambda v: v.repeat_interleave(sizes, output_size=x.numel())
+    slot = ((x - per_elem(lo)) * per_elem(scale)).nan_to_num_().long().clamp_(0, bins - 1)
+    slot = torch.where(x == 0, bins, slot)
+    slot = torch.where(finite, slot, bins + 1 + x.isinf().long())
+    counts = torch.zeros(n * (bins + 3), device=x.device).index_add_(
+        0, seg * (bins + 3) + slot, torch.ones_like(x)).view(n, bins + 3)
+    hist, flags = counts[:, :bins].clone(), counts[:, bins:]
+    zero_bin = (-lo * scale).long().clamp_(0, bins - 1)
+    hist.scatter_add_(1, zero_bin[:, None], flags[:, :1])
+    max_abs = torch.maximum(-lo, hi)  # finite extremes bound |x|
+    return torch.cat([max_abs[:, None], flags / sizes[:, None],
+                      lo[:, None], hi[:, None], hist], 1)
+
+
+def _update_ratios(weights, before) -> torch.Tensor:
+    """``||w - w_before|| / ||w||`` per tensor, batched like :func:`_describe`."""
+    w, seg, _ = _segments(weights)
+    delta = w - _segments(before)[0]
+    sq = torch.zeros(2, len(weights), device=w.device)
+    sq[0].index_add_(0, seg, delta * delta)
+    sq[1].index_add_(0, seg, w * w)
+    return sq[0].sqrt() / sq[1].sqrt().clamp_min(1e-12)
+
+
+class ModelStats:
+    """Rotating-window statistics sampler for one model.
+
+    A window holds up to *layers* parameter tensors and, past the first,
+    at most *max_elements* parameter elements in total.
+    """
+
+    def __init__(self, model: torch.nn.Module, layers: int = 8, bins: int = 64,
+                 max_elements: int = 1 << 22):
+        self.params = [(n, p) for n, p in model.named_parameters()
+                       if p.requires_grad and p.numel() > 0]
+        self.layers, self.bins, self.max_elements = layers, bins, max_elements
+        self._cursor = 0
+        self._snapshot: dict[str, torch.Tensor] = {}
+        self._snapshot_step: int | None = None
+
+    def _window(self) -> list[tuple[str, torch.nn.Parameter]]:
+        n = len(self.params)
+        window, size = [], 0
+        for i in range(min(self.layers, n)):
+            name, p = self.params[(self._cursor + i) % n]
+            if window and size + p.numel() > self.max_elements:
+                break
+            window.append((name, p))
+            size += p.numel()
+        return window
+
+    def snapshot(self, step: int):
+        """Remember the next window's weights to measure the coming update."""
+        self._snapshot = {n: p.detach().clone() for n, p in self._window()}
+        self._snapshot_step = step
+
+    def collect(self, step: int) -> dict:
+        """Compute stats for the current window and advance the rotation."""
+        window = self._window()
+        self._cursor = (self._cursor + len(window)) % max(len(self.params), 1)
+        if not window:
+            return {}
+        tensors, layout = [], []
+        for name, p in window:
+            kinds = ["weight"] + (["grad"] if p.grad is not None else [])
+            tensors += [p if kind == "weight" else p.grad for kind in kinds]
+            layout.append((name, kinds))
+        ratio = [(n, p) for n, p in window
+                 if self._snapshot_step == step - 1 and n in self._snapshot]
+        parts = [_describe(tensors, self.bins).flatten()]
+        if ratio:
+            parts.append(_update_ratios([p for _, p in ratio],
+                                        [self._snapshot[n] for n, _ in ratio]))
+        self._snapshot, self._snapshot_step = {}, None
+
+        flat = torch.cat(parts).cpu().tolist()  # the one host transfer
+        width = len(_SCALARS) + 2 + self.bins
+        out, i = {}, 0
+        for name, kinds in layout:
+            for kind in kinds:
+                row = flat[i:i + width]
+                i += width
+                for key, val in zip(_SCALARS, row):
+                    out[f"{kind}_{key}/{name}"] = val
+                lo, hi = row[len(_SCALARS):len(_SCALARS) + 2]
+                edges = [lo + (hi - lo) * b / self.bins for b in range(self.bins + 1)]
+                out[f"{kind}_hist/{name}"] = wandb.Histogram(
+                    np_histogram=(row[len(_SCALARS) + 2:], edges))
+        for (name, _), val in zip(ratio, flat[i:]):
+            out[f"update_ratio/{name}"] = val
+        return out
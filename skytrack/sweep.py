@@ -15,6 +15,7 @@ sweep:                     # infrastructure controls
   template: sky_task.yaml  # single-job task file
   max_parallel: 2
   max_retries: 2
+  profile: 500-510         # optional, exported as $SKYTRACK_PROFILE
 grid: { … }                # used when mode == grid
 benchmark:                 # used when mode == benchmark
   script: scripts/eval.py
@@ -28,6 +29,7 @@ import itertools, uuid, yaml, subprocess, time, json, sys
 from pathlib import Path
 from typing import Dict, Iterable, Any
 import subprocess, time, json, sys, yaml, itertools, uuid, re
+from .profiler import ENV_VAR as PROFILE_ENV, env_value as _profile_env
 
 _STATUS_RE = re.compile(r"^\s*(\S+)\s+(RUNNING|INIT)\b")
 NUM_RE = re.compile(r"^[+-]?\d+(\.\d*)?([eE][+-]?\d+)?$")
@@ -121,6 +123,8 @@ def sweep(cfg_path: str | Path):
         task = _load_yaml(sweep_cfg["template"])
         task.setdefault("envs", {}).update({k: str(v) for k, v in env.items()})
         task["envs"]["WANDB_RUN_NAME"] = slug
+        if sweep_cfg.get("profile"):
+            task["envs"][PROFILE_ENV] = _profile_env(sweep_cfg["profile"])
 
         task_path = TASKS_DIR / f"{slug}.yaml"
         with task_path.open("w") as f:
@@ -148,6 +152,7 @@ def sweep(cfg_path: str | Path):
             state[j["name"]] = "DONE"
         save_state()
 
+        retried = False
         for j in failed:
             cnt = state.get(j["name"], 0)
             if isinstance(cnt, int) and cnt < sweep_cfg["max_retries"]:
@@ -158,10 +163,12 @@ def sweep(cfg_path: str | Path):
                 ])
                 state[j["name"]] = cnt + 1
                 save_state()
+                retried = True
             else:
                 print(f"✖️ perm-failed {j['name']}")
 
-        if not active and not failed:
+        # perm-failed jobs stay FAILED in `sky status`; don't wait on them
+        if not active and not retried:
             print("🎉 all jobs finished")
             break
 
@@ -0,0 +1,14 @@
+from benchmarks import bench_sweep
+from benchmarks.fake_sky import FakeSky
+
+def test_bench_sweep_quick_finishes():
+    results = bench_sweep.run(quick=True)
+    timed_out = {k: v for k, v in results.items() if k.endswith("/timed_out")}
+    assert timed_out and not any(timed_out.values())
+    assert results["sweep/calls_launch"] >= 8  # every grid point was launched
+
+def test_sweep_exits_once_jobs_perm_fail(tmp_path):
+    fake = FakeSky(fail_rate=1.0, time_limit=86400.0)
+    results = bench_sweep._simulate("sweep", fake, bench_sweep._sky_tune(tmp_path, 2))
+    assert results["sweep/timed_out"] == 0
+    assert results["sweep/calls_launch"] == 2 * 3  # first try + max_retries
@@ -0,0 +1,70 @@
+import math
+from skytrack.downsample import Downsampler
+
+def _run(ds, key, values):
+    out = []
+    for step, v in enumerate(values):
+        row = ds({key: v}, step)
+        if key in row:
+            out.append(row[key])
+    out += [r[key] for r in ds.flush() if key in r]
+    return out
+
+def test_minmax_budget_keeps_extremes():
+    values = [math.sin(i / 50) for i in range(10_000)]
+    values[4321] = 99.0
+    values[8765] = -99.0
+    kept = _run(Downsampler(budget=200, horizon=10_000), "loss/train", values)
+    assert len(kept) <= 200
+    assert 99.0 in kept and -99.0 in kept
+
+def test_adaptive_and_lttb_reduce_points():
+    values = [float(i % 17) for i in range(20_000)]
+    for method in ("minmax", "lttb"):
+        kept = _run(Downsampler(budget=100, method=method), "x", values)
+        assert 50 < len(kept) < 1000
+
+def test_rules_grouping_and_cap():
+    ds = Downsampler(rules=[
+        {"match": "lr*", "method": "none"},
+        {"match": "grad/*", "group": 3, "reduce": "max", "max_series": 1},
+    ])
+    row = ds({"lr/group_0": 0.1, "note": "txt",
+              "grad/model.layers.0.q.weight": 1.0,
+              "grad/model.layers.0.k.weight": 3.0,
+              "grad/model.layers.1.q.weight": 5.0}, 0)
+    assert row == {"lr/group_0": 0.1, "note": "txt", "grad/model.layers.0": 3.0,
+                   "_step/grad/model.layers.0": 0}
+
+def test_points_keep_original_step():
+    ds = Downsampler(budget=10, horizon=100)
+    seen = {}
+    for step in range(100):
+        row = ds({"loss": 99.0 if step == 42 else 0.0}, step)
+        if "loss" in row:
+            seen[row["_step/loss"]] = row["loss"]
+    assert seen[42] == 99.0
+
+def test_st_log_flush_emits_buffered_points(monkeypatch):
+    import wandb
+    import skytrack.logging as stl
+    logged = []
+    monkeypatch.setattr(wandb, "log", lambda row, step=None, commit=None: logged.append(dict(row)))
+    monkeypatch.setattr(wandb, "run", object())
+    monkeypatch.setattr(stl, "_DOWNSAMPLER", Downsampler(budget=10, horizon=100))
+    for step in range(100):
+        stl.log({"loss": float(step)}, step=step)
+    n = len(logged)
+    stl.log({"train_runtime": 1.5}, step=100)  # one-off metric at the end
+    stl.flush()
+    steps = [r["_step/loss"] for r in logged if "loss" in r]
+    assert len(logged) > n and max(steps) == 99
+    assert any(r.get("train_runtime") == 1.5 for r in logged)
+
+def test_sparse_points_pass_through_after_flush():
+    ds = Downsampler(budget=10, horizon=100)
+    for step in range(100):
+        ds({"loss": float(step)}, step)
+    ds.flush()
+    assert ds({"eval_loss": 0.2}, 1000) == {"eval_loss": 0.2, "_step/eval_loss": 1000}
+    assert ds({"loss": 5.0}, 1001) == {"loss": 5.0, "_step/loss": 1001}
@@ -0,0 +1,40 @@
+import pytest, torch, wandb
+from skytrack.profiler import StepProfiler, _parse_window, from_config, env_value
+
+def test_parse_window():
+    assert _parse_window("500-510") == (500, 510)
+    assert _parse_window("7") == (7, 7)
+    assert _parse_window([3, 4]) == (3, 4)
+    with pytest.raises(ValueError):
+        _parse_window("10-2")
+
+def test_from_config_env(monkeypatch):
+    assert from_config({}) is None
+    monkeypatch.setenv("SKYTRACK_PROFILE", env_value({"steps": "5-6", "top_n": 3}))
+    prof = from_config({"profile": "1-2"})
+    assert prof.window == (5, 6) and prof.top_n == 3
+
+def test_from_config_env_list_window(monkeypatch):
+    monkeypatch.setenv("SKYTRACK_PROFILE", env_value([500, 510]))
+    assert from_config({}).window == (500, 510)
+
+def test_missed_window_reenables_anomaly():
+    prof = StepProfiler(steps="500-510", anomaly=2.0)
+    prof.step(600)  # resumed past the window
+    assert prof.window is None
+
+def test_window_capture(tmp_path, monkeypatch):
+    import skytrack.logging as stl
+    logged = {}
+    monkeypatch.setattr(stl, "log", lambda data, **kw: logged.update(data))
+    run = wandb.init(mode="offline", dir=tmp_path)
+    model = torch.nn.Linear(8, 8)
+    prof = StepProfiler(steps="2-4", dir=tmp_path)
+    for step in range(7):
+        prof.step(step)
+        model(torch.randn(4, 8)).sum().backward()
+    run.finish()
+    assert (tmp_path / "trace_steps2-4.json").exists()
+    rows = logged["profile/steps"].data
+    assert [r[0] for r in rows] == [2, 3, 4]
+    assert all(r[1] > 0 for r in rows) and logged["profile/step_cpu_ms"] > 0
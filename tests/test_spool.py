@@ -0,0 +1,93 @@
+import skytrack.logging as stl
+from skytrack.spool import Spool, read_segment
+
+class _Sink:
+    def __init__(self, fail=False, fail_after=None):
+        self.rows, self.fail, self.fail_after = [], fail, fail_after
+    def __call__(self, row, step=None):
+        if self.fail or len(self.rows) == self.fail_after:
+            raise ConnectionError("offline")
+        self.rows.append((step, dict(row)))
+
+def test_append_upload_in_order(tmp_path):
+    sink = _Sink()
+    sp = Spool(tmp_path, segment_bytes=256, log_fn=sink, upload_interval=0.01)
+    for step in range(50):
+        sp.append({"loss/train": step * 0.5, "tag": "x"}, step=step)
+    assert sp.drain()
+    sp.close()
+    assert [s for s, _ in sink.rows] == list(range(50))
+    assert sink.rows[7][1] == {"loss/train": 3.5, "tag": "x"}
+    assert not list(tmp_path.glob("seg-*.bin"))
+
+def test_replay_after_crash_skips_known_steps(tmp_path):
+    sp = Spool(tmp_path, log_fn=_Sink(fail=True), upload_interval=0.01)
+    for step in range(10):
+        sp.append({"loss": float(step)}, step=step)
+    sp.close(drain=False)  # "VM died" with the network down
+    # torn tail from a half-written record
+    seg = sorted(tmp_path.glob("seg-*.bin"))[-1]
+    seg.write_bytes(seg.read_bytes() + b"\x02\xff\x00")
+    assert len(list(read_segment(seg))) == 10
+
+    sink = _Sink()
+    sp = Spool(tmp_path, min_step=4, log_fn=sink, upload_interval=0.01)
+    sp.append({"loss": 10.0}, step=10)
+    assert sp.drain()
+    sp.close()
+    assert [s for s, _ in sink.rows] == [4, 5, 6, 7, 8, 9, 10]
+
+def test_partial_upload_failure_keeps_cursor_and_extras(tmp_path):
+    sink = _Sink(fail_after=3)
+    sp = Spool(tmp_path, log_fn=sink, upload_interval=60)
+    sp._closed = True  # stop the uploader and drive it by hand below
+    sp._wake.set()
+    sp._thread.join(timeout=5.0)
+    sp._closed = False
+    for step in range(6):
+        sp.append({"loss": float(step), "tag": f"t{step}"}, step=step)
+    assert not sp._upload_once()
+    assert len(sink.rows) == 3 and sp._cursor[1] > 0
+    sink.fail_after = None
+    assert sp._upload_once()
+    assert [s for s, _ in sink.rows] == list(range(6))
+    assert [r["tag"] for _, r in sink.rows] == [f"t{i}" for i in range(6)]
+
+def test_st_log_merges_uncommitted_rows(tmp_path, monkeypatch):
+    sink = _Sink()
+    sp = Spool(tmp_path, log_fn=sink, upload_interval=0.01)
+    monkeypatch.setattr(stl, "_SPOOL", sp)
+    stl.log({"profile/step_cpu_ms": 1.5}, commit=False)
+    stl.log({"loss": 0.5}, step=3)
+    stl.log({"profile/step_cpu_ms": 2.5}, commit=False)
+    stl.flush()
+    sp.close()
+    assert sink.rows == [(3, {"profile/step_cpu_ms": 1.5, "loss": 0.5}),
+                         (None, {"profile/step_cpu_ms": 2.5})]
+
+def test_tail_reads_resume_and_closed_append_is_dropped(tmp_path):
+    sink = _Sink()
+    sp = Spool(tmp_path, log_fn=sink, upload_interval=0.01)
+    for step in range(20):
+        sp.append({f"k{step % 3}": float(step)}, step=step)
+        if step % 5 == 4:
+            assert sp.drain()
+    seg, keys, parsed = sp._parsed
+    assert keys == {0: "k0", 1: "k1", 2: "k2"} and parsed == sp._cursor[1]
+    sp.close()
+    sp.append({"late": 1.0}, step=20)  # no "write to closed file"
+    assert [s for s, _ in sink.rows] == list(range(20))
+    assert sink.rows[19][1] == {"k1": 19.0}
+
+def test_shutdown_closes_profiler_before_spool(tmp_path, monkeypatch):
+    import wandb
+    class _Prof:
+        def close(self):
+            stl.log({"profile/step_cpu_ms": 2.0}, commit=False)
+    sink = _Sink()
+    monkeypatch.setattr(wandb, "run", object())
+    monkeypatch.setattr(stl, "_PROFILER", _Prof())
+    monkeypatch.setattr(stl, "_SPOOL", Spool(tmp_path, log_fn=sink, upload_interval=0.01))
+    stl._shutdown()
+    assert sink.rows == [(None, {"profile/step_cpu_ms": 2.0})]
+    assert stl._PROFILER is None and stl._SPOOL is None
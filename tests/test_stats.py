@@ -0,0 +1,49 @@
+import pytest, torch
+from skytrack.stats import ModelStats
+
+def test_rotating_window_and_update_ratio():
+    model = torch.nn.Sequential(torch.nn.Linear(4, 4), torch.nn.Linear(4, 2))
+    opt = torch.optim.SGD(model.parameters(), lr=0.1)
+    sampler = ModelStats(model, layers=2, bins=8)
+    model(torch.randn(3, 4)).sum().backward()
+    sampler.snapshot(0)
+    opt.step()
+    first = sampler.collect(1)
+    assert {"weight_max_abs/0.weight", "grad_zero_frac/0.bias",
+            "update_ratio/0.weight"} <= first.keys()
+    assert sum(first["weight_hist/0.weight"].histogram) == 16
+    second = sampler.collect(2)
+    assert "weight_nan_frac/1.weight" in second
+    assert not any(k.startswith("update_ratio/") for k in second)
+
+def test_empty_params_and_nonfinite_range():
+    model = torch.nn.Linear(4, 4)
+    model.register_parameter("empty", torch.nn.Parameter(torch.empty(0)))
+    with torch.no_grad():
+        model.weight.uniform_(1.0, 2.0)
+        model.weight[0, 0] = float("nan")
+    stats = ModelStats(model, layers=8, bins=4).collect(0)
+    assert not any(k.endswith("/empty") for k in stats)
+    edges = stats["weight_hist/weight"].bins
+    assert 1.0 <= edges[0] and edges[-1] <= 2.0
+    assert stats["weight_nan_frac/weight"] == 1 / 16
+
+def test_batched_stats_match_per_tensor_and_element_cap():
+    import skytrack.logging as stl
+    model = torch.nn.Sequential(torch.nn.Linear(6, 5), torch.nn.Linear(5, 3))
+    model(torch.randn(2, 6)).sum().backward()
+    stats = ModelStats(model, layers=4, bins=8).collect(0)
+    for name, p in model.named_parameters():
+        assert stats[f"weight_max_abs/{name}"] == pytest.approx(p.abs().max().item())
+        assert stats[f"grad_zero_frac/{name}"] == pytest.approx((p.grad == 0).float().mean().item())
+        assert sum(stats[f"grad_hist/{name}"].histogram) == p.numel()
+    with torch.no_grad():
+        model[1].bias.copy_(torch.tensor([0.0, float("inf"), 0.5]))
+    stats = ModelStats(model, layers=4, bins=8).collect(1)
+    assert sum(stats["weight_hist/1.bias"].histogram) == 2
+    assert stats["weight_zero_frac/1.bias"] == stats["weight_inf_frac/1.bias"] == pytest.approx(1 / 3)
+    capped = ModelStats(model, layers=4, bins=8, max_elements=35)
+    assert [n for n, _ in capped._window()] == ["0.weight", "0.bias"]
+    stl.log_model_stats(model, 1, layers=1)
+    stl.log_model_stats(model, 1, layers=2)
+    assert stl._STATS[model].layers == 2